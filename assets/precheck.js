@@ -0,0 +1,698 @@
+// precheck.js — In-browser header pre-check (runs before upload)
+//
+// Reads only the leading / trailing bytes of a file with File.slice and checks
+// them against the specs served at /specs. Anything that can't be read here is
+// treated as plausible and left to the server, which stays authoritative.
+
+let SPEC_DATA = null;
+
+fetch("/specs")
+    .then((response) => (response.ok ? response.json() : null))
+    .then((data) => {
+        SPEC_DATA = data;
+    })
+    .catch(() => {
+        SPEC_DATA = null;
+    });
+
+const PRECHECK_FAIL_MESSAGE = "❌ Artwork DOES NOT meet specifications.";
+
+// --------------------------------------
+// ENTRY POINT
+// --------------------------------------
+
+// Returns a fail result ({ status, message, issues }) or null if the file
+// looks plausible (or couldn't be pre-checked) and should be uploaded.
+async function precheckFile(file, specName, pageMode = "single", orderedCount = 0) {
+    if (!SPEC_DATA || !specName) return null;
+
+    const specs = SPEC_DATA[specName];
+    if (!specs) return null;
+
+    const name = file.name.toLowerCase();
+    let issues = null;
+
+    try {
+        if (name.endsWith(".jpg") || name.endsWith(".jpeg")) {
+            if (specs.format !== "digital") {
+                issues = [
+                    "File type .jpg is not accepted for this board. " +
+                    "Static formats must be supplied as a print-ready PDF."
+                ];
+            } else if (name.endsWith(".jpeg")) {
+                issues = [
+                    "File type .jpeg not accepted. " +
+                    "Please export as .jpg and upload again."
+                ];
+            } else {
+                issues = await precheckJpg(file, specs);
+            }
+        } else if (name.endsWith(".pdf")) {
+            if (specs.format !== "static") {
+                issues = [
+                    "File type PDF is not accepted for digital boards. " +
+                    "Digital formats must be supplied as a .jpg."
+                ];
+            } else {
+                issues = await precheckPdf(file, specs, pageMode, orderedCount);
+            }
+        } else {
+            issues = [
+                "Unsupported file type. Only .jpg (digital) or PDF (static) are accepted."
+            ];
+        }
+    } catch (err) {
+        // Unreadable here doesn't mean invalid — let the server decide
+        return null;
+    }
+
+    if (!issues || !issues.length) return null;
+
+    return {
+        status: "fail",
+        message: PRECHECK_FAIL_MESSAGE,
+        issues,
+    };
+}
+
+// --------------------------------------
+// DIGITAL JPG PRE-CHECK
+// --------------------------------------
+
+async function precheckJpg(file, specs) {
+    const header = await readJpegHeader(file);
+    if (!header) return null;
+
+    if (!header.isJpeg) {
+        return ["File type is not .jpg. Please export as .jpg and re-upload."];
+    }
+
+    const issues = [];
+
+    if (header.width !== specs.width_px) {
+        issues.push(
+            `Incorrect width. Expected ${specs.width_px}px. Please adjust and re-upload.`
+        );
+    }
+
+    if (header.height !== specs.height_px) {
+        issues.push(
+            `Incorrect height. Expected ${specs.height_px}px. Please adjust and re-upload.`
+        );
+    }
+
+    // DPI only known from a JFIF header with real units; otherwise EXIF may
+    // still supply it, so leave that to the server
+    if (header.dpi !== null && Math.trunc(header.dpi) !== specs.dpi) {
+        issues.push(
+            `Incorrect DPI. Digital screens require ${specs.dpi}dpi. ` +
+            "Please adjust and re-upload."
+        );
+    }
+
+    if (header.components !== 3) {
+        issues.push(
+            "Incorrect colour mode. Digital screens require RGB. " +
+            "Please convert to RGB and re-upload."
+        );
+    }
+
+    return issues;
+}
+
+// Walks JPEG markers up to the first SOF segment, one small slice at a time.
+async function readJpegHeader(file) {
+    const start = await readBytes(file, 0, 2);
+    if (start[0] !== 0xFF || start[1] !== 0xD8) return { isJpeg: false };
+
+    let dpi = null;
+    let seenJfif = false;
+    let pos = 2;
+
+    while (pos + 4 <= file.size) {
+        const m = await readBytes(file, pos, pos + 4);
+        if (m[0] !== 0xFF) return null;
+
+        const marker = m[1];
+
+        // Fill bytes / standalone markers carry no length
+        if (marker === 0xFF) {
+            pos += 1;
+            continue;
+        }
+        if (marker === 0x01 || (marker >= 0xD0 && marker <= 0xD7)) {
+            pos += 2;
+            continue;
+        }
+
+        const length = (m[2] << 8) | m[3];
+
+        // APP0 "JFIF": units 1 = dpi, 2 = dots per cm
+        if (marker === 0xE0 && !seenJfif) {
+            const seg = await readBytes(file, pos + 4, pos + 16);
+            if (bytesToString(seg.subarray(0, 5)) === "JFIF\0") {
+                seenJfif = true;
+                const units = seg[7];
+                const density = (seg[8] << 8) | seg[9];
+                if (units === 1) dpi = density;
+                if (units === 2) dpi = density * 2.54;
+            }
+        }
+
+        // SOF0–SOF15, excluding DHT (C4), JPG (C8) and DAC (CC)
+        if (marker >= 0xC0 && marker <= 0xCF &&
+            marker !== 0xC4 && marker !== 0xC8 && marker !== 0xCC) {
+            const seg = await readBytes(file, pos + 4, pos + 10);
+            return {
+                isJpeg: true,
+                height: (seg[1] << 8) | seg[2],
+                width: (seg[3] << 8) | seg[4],
+                components: seg[5],
+                dpi,
+            };
+        }
+
+        // Start of scan: no SOF found before the pixel data
+        if (marker === 0xDA) return null;
+
+        pos += 2 + length;
+    }
+
+    return null;
+}
+
+// --------------------------------------
+// STATIC PDF PRE-CHECK
+// --------------------------------------
+
+async function precheckPdf(file, specs, pageMode, orderedCount) {
+    const head = bytesToString(await readBytes(file, 0, 1024));
+    const info = await readPdfPageInfo(file);
+
+    if (!info) {
+        if (head.indexOf("%PDF-") === -1) {
+            return [
+                "Unable to read PDF file. Please re-upload a clean, print-ready PDF file."
+            ];
+        }
+        return null;
+    }
+
+    const issues = [];
+
+    if (pageMode === "order") {
+        if (info.pageCount !== orderedCount) {
+            issues.push(
+                `PDF has ${info.pageCount} page(s) but ${orderedCount} size(s) ` +
+                "were selected. Please select one size per page and re-upload."
+            );
+        }
+        return issues;
+    }
+
+    // Label / auto modes map each page to its own spec on the server
+    if (pageMode !== "single") return issues;
+
+    if (info.pageCount !== 1) {
+        issues.push(
+            "Multi-page PDF detected. Please re-upload as single-page PDF."
+        );
+    }
+
+    if (!info.mediaBox) return issues;
+
+    const pageW = mmFromPoints(info.mediaBox[2] - info.mediaBox[0]);
+    const pageH = mmFromPoints(info.mediaBox[3] - info.mediaBox[1]);
+    const nearly = (a, b) => Math.abs(a - b) <= 0.5;
+
+    if (!(nearly(pageW, specs.width_mm) && nearly(pageH, specs.height_mm))) {
+        issues.push(
+            `Incorrect page size. Expected ${specs.width_mm}mm × ${specs.height_mm}mm. ` +
+            `Detected ${pageW.toFixed(1)}mm × ${pageH.toFixed(1)}mm. ` +
+            "Please re-upload at correct size with no bleed or crop marks."
+        );
+    }
+
+    if ((pageW - specs.width_mm) > 0.5 || (pageH - specs.height_mm) > 0.5) {
+        issues.push(
+            "Bleed detected. Page is larger than the required size. " +
+            "Please re-upload at final size with no bleed or crop marks."
+        );
+    }
+
+    return issues;
+}
+
+// Page count + first page MediaBox, via the trailing xref.
+// Returns null for anything unusual (encrypted, damaged, unsupported filters).
+async function readPdfPageInfo(file) {
+    const xref = await readXref(file);
+    if (!xref || xref.trailer["/Encrypt"]) return null;
+
+    const ctx = { file, entries: xref.entries, objectStreams: new Map() };
+
+    const root = await resolve(ctx, xref.trailer["/Root"]);
+    const pages = root && await resolve(ctx, root["/Pages"]);
+    if (!pages) return null;
+
+    const pageCount = await resolve(ctx, pages["/Count"]);
+    if (typeof pageCount !== "number") return null;
+
+    // Walk down to the first page; MediaBox may be inherited from a parent
+    let node = pages;
+    let mediaBox = await resolve(ctx, node["/MediaBox"]);
+
+    for (let depth = 0; node && node["/Type"] !== "/Page" && depth < 32; depth++) {
+        const kids = await resolve(ctx, node["/Kids"]);
+        if (!Array.isArray(kids) || !kids.length) {
+            node = null;
+            break;
+        }
+        node = await resolve(ctx, kids[0]);
+        if (node && node["/MediaBox"]) {
+            mediaBox = await resolve(ctx, node["/MediaBox"]);
+        }
+    }
+
+    if (!node || !Array.isArray(mediaBox) || mediaBox.length !== 4) {
+        return { pageCount, mediaBox: null };
+    }
+
+    const box = [];
+    for (const value of mediaBox) {
+        box.push(await resolve(ctx, value));
+    }
+    if (box.some((v) => typeof v !== "number")) {
+        return { pageCount, mediaBox: null };
+    }
+
+    return { pageCount, mediaBox: box };
+}
+
+// --------------------------------------
+// PDF XREF + OBJECT READING
+// --------------------------------------
+
+async function readXref(file) {
+    const tailStart = Math.max(0, file.size - 2048);
+    const tail = bytesToString(await readBytes(file, tailStart, file.size));
+    const idx = tail.lastIndexOf("startxref");
+    if (idx === -1) return null;
+
+    let offset = parseInt(tail.slice(idx + 9).trim(), 10);
+    const entries = new Map();
+    const seen = new Set();
+    let trailer = null;
+
+    // Newest section first; older sections (/Prev) only fill gaps
+    while (Number.isFinite(offset) && !seen.has(offset)) {
+        seen.add(offset);
+
+        const sectionTrailer = await readXrefSection(file, offset, entries);
+        if (!trailer) trailer = sectionTrailer;
+
+        // Hybrid files keep extra entries in an xref stream
+        if (typeof sectionTrailer["/XRefStm"] === "number") {
+            await readXrefSection(file, sectionTrailer["/XRefStm"], entries);
+        }
+
+        offset = sectionTrailer["/Prev"];
+    }
+
+    return trailer ? { entries, trailer } : null;
+}
+
+async function readXrefSection(file, offset, entries) {
+    const peek = bytesToString(await readBytes(file, offset, offset + 16));
+
+    if (!peek.trimStart().startsWith("xref")) {
+        return readXrefStream(file, offset, entries);
+    }
+
+    // Classic table: re-read with a bigger window until it fits
+    for (let size = 65536; ; size *= 4) {
+        const end = Math.min(file.size, offset + size);
+        const text = bytesToString(await readBytes(file, offset, end));
+        const found = new Map();
+
+        let pos = text.indexOf("xref") + 4;
+        const subsection = /\s*(\d+)\s+(\d+)/y;
+        const entry = /\s*(\d+)\s+(\d+)\s+([nf])/y;
+        let trailer = null;
+
+        while (!trailer) {
+            pos = skipWhitespace(text, pos);
+            if (text.startsWith("trailer", pos)) {
+                try {
+                    trailer = parseValue(text, pos + 7).value;
+                } catch (err) {
+                    break;
+                }
+                continue;
+            }
+
+            subsection.lastIndex = pos;
+            const sub = subsection.exec(text);
+            if (!sub) break;
+            pos = subsection.lastIndex;
+
+            const first = parseInt(sub[1], 10);
+            const count = parseInt(sub[2], 10);
+
+            let i = 0;
+            for (; i < count; i++) {
+                entry.lastIndex = pos;
+                const e = entry.exec(text);
+                if (!e) break;
+                pos = entry.lastIndex;
+                found.set(first + i, e[3] === "n"
+                    ? { type: 1, offset: parseInt(e[1], 10) }
+                    : { type: 0 });
+            }
+            if (i < count) break;
+        }
+
+        if (trailer) {
+            for (const [num, value] of found) {
+                if (!entries.has(num)) entries.set(num, value);
+            }
+            return trailer;
+        }
+
+        if (end >= file.size) throw new Error("Unreadable xref table");
+    }
+}
+
+async function readXrefStream(file, offset, entries) {
+    const { dict, data } = await readStream(null, file, offset);
+    if (dict["/Type"] !== "/XRef") throw new Error("Not an xref stream");
+
+    const widths = dict["/W"];
+    const index = dict["/Index"] || [0, dict["/Size"]];
+    const rowLen = widths[0] + widths[1] + widths[2];
+
+    const field = (row, start, width) => {
+        let value = 0;
+        for (let i = 0; i < width; i++) value = value * 256 + data[row + start + i];
+        return value;
+    };
+
+    let row = 0;
+    for (let s = 0; s < index.length; s += 2) {
+        for (let i = 0; i < index[s + 1]; i++, row += rowLen) {
+            if (row + rowLen > data.length) return dict;
+
+            const num = index[s] + i;
+            const type = widths[0] ? field(row, 0, widths[0]) : 1;
+            const a = field(row, widths[0], widths[1]);
+            const b = field(row, widths[0] + widths[1], widths[2]);
+
+            if (entries.has(num)) continue;
+            if (type === 1) entries.set(num, { type: 1, offset: a });
+            else if (type === 2) entries.set(num, { type: 2, stream: a, index: b });
+            else entries.set(num, { type: 0 });
+        }
+    }
+
+    return dict;
+}
+
+async function resolve(ctx, value) {
+    if (value && typeof value === "object" && value.ref !== undefined) {
+        return getObject(ctx, value.ref);
+    }
+    return value;
+}
+
+async function getObject(ctx, num) {
+    const entry = ctx.entries.get(num);
+    if (!entry || entry.type === 0) return null;
+
+    if (entry.type === 1) {
+        const obj = await readIndirectObject(ctx.file, entry.offset, num);
+        return obj.value;
+    }
+
+    // Compressed: object lives inside an object stream
+    let objects = ctx.objectStreams.get(entry.stream);
+    if (!objects) {
+        objects = await readObjectStream(ctx, entry.stream);
+        ctx.objectStreams.set(entry.stream, objects);
+    }
+    if (!objects.has(num)) throw new Error("Object missing from its object stream");
+    return objects.get(num);
+}
+
+async function readObjectStream(ctx, streamNum) {
+    const entry = ctx.entries.get(streamNum);
+    if (!entry || entry.type !== 1) throw new Error("Missing object stream");
+
+    const { dict, data } = await readStream(ctx, ctx.file, entry.offset, streamNum);
+    const text = bytesToString(data);
+    const first = dict["/First"];
+
+    // Header: N pairs of "objnum offset"
+    const numbers = [];
+    let pos = 0;
+    for (let i = 0; i < dict["/N"] * 2; i++) {
+        const parsed = parseValue(text, pos);
+        numbers.push(parsed.value);
+        pos = parsed.pos;
+    }
+
+    const objects = new Map();
+    for (let i = 0; i < numbers.length; i += 2) {
+        objects.set(numbers[i], parseValue(text, first + numbers[i + 1]).value);
+    }
+    return objects;
+}
+
+// Reads "n g obj <value>", growing the window if the value runs past it.
+// With num set, the header must be that object: a wrong xref offset throws
+// (and the pre-check passes the file to the server) rather than misreading.
+async function readIndirectObject(file, offset, num = null) {
+    for (let size = 4096; ; size *= 4) {
+        const end = Math.min(file.size, offset + size);
+        const text = bytesToString(await readBytes(file, offset, end));
+
+        const header = /\s*(\d+)\s+(\d+)\s+obj/y;
+        const h = header.exec(text);
+        if (!h) throw new Error("Not an indirect object");
+        if (num !== null && parseInt(h[1], 10) !== num) {
+            throw new Error("Xref offset points at the wrong object");
+        }
+
+        try {
+            const parsed = parseValue(text, header.lastIndex);
+            return { value: parsed.value, text, pos: parsed.pos };
+        } catch (err) {
+            if (end >= file.size) throw err;
+        }
+    }
+}
+
+// Reads a stream object's dictionary and its (Flate-decoded) data.
+async function readStream(ctx, file, offset, num = null) {
+    const obj = await readIndirectObject(file, offset, num);
+    const dict = obj.value;
+
+    const match = /\s*stream(\r\n|\n|\r)/y;
+    match.lastIndex = obj.pos;
+    if (!match.exec(obj.text)) throw new Error("Stream keyword missing");
+
+    const length = ctx ? await resolve(ctx, dict["/Length"]) : dict["/Length"];
+    if (typeof length !== "number") throw new Error("Unknown stream length");
+
+    const dataStart = offset + match.lastIndex;
+    let data = await readBytes(file, dataStart, dataStart + length);
+
+    let filter = dict["/Filter"];
+    let parms = dict["/DecodeParms"];
+    if (Array.isArray(filter)) {
+        if (filter.length > 1) throw new Error("Chained filters not supported");
+        filter = filter[0];
+        parms = Array.isArray(parms) ? parms[0] : parms;
+    }
+
+    if (filter === "/FlateDecode") {
+        data = unpredict(await inflate(data), parms);
+    } else if (filter !== undefined) {
+        throw new Error("Unsupported stream filter");
+    }
+
+    return { dict, data };
+}
+
+async function inflate(bytes) {
+    if (typeof DecompressionStream === "undefined") {
+        throw new Error("DecompressionStream not available");
+    }
+    const stream = new Blob([bytes]).stream()
+        .pipeThrough(new DecompressionStream("deflate"));
+    return new Uint8Array(await new Response(stream).arrayBuffer());
+}
+
+// PNG predictors (10+), one byte per pixel as used by xref / object streams
+function unpredict(data, parms) {
+    const predictor = (parms && parms["/Predictor"]) || 1;
+    if (predictor < 10) return data;
+
+    const columns = parms["/Columns"] || 1;
+    const rowLen = columns + 1;
+    const rows = Math.floor(data.length / rowLen);
+    const out = new Uint8Array(rows * columns);
+    let prev = new Uint8Array(columns);
+
+    for (let r = 0; r < rows; r++) {
+        const type = data[r * rowLen];
+        const raw = data.subarray(r * rowLen + 1, (r + 1) * rowLen);
+        const cur = out.subarray(r * columns, (r + 1) * columns);
+
+        for (let i = 0; i < columns; i++) {
+            const left = i > 0 ? cur[i - 1] : 0;
+            const up = prev[i];
+            const upLeft = i > 0 ? prev[i - 1] : 0;
+            let value = raw[i];
+
+            if (type === 1) value += left;
+            else if (type === 2) value += up;
+            else if (type === 3) value += Math.floor((left + up) / 2);
+            else if (type === 4) {
+                const p = left + up - upLeft;
+                const pa = Math.abs(p - left);
+                const pb = Math.abs(p - up);
+                const pc = Math.abs(p - upLeft);
+                value += (pa <= pb && pa <= pc) ? left : (pb <= pc ? up : upLeft);
+            }
+
+            cur[i] = value & 0xFF;
+        }
+        prev = cur;
+    }
+
+    return out;
+}
+
+// --------------------------------------
+// MINIMAL PDF OBJECT PARSER
+// --------------------------------------
+// Names -> "/Name", refs -> { ref, gen }, dicts -> objects keyed by "/Name",
+// strings -> null (never needed here).
+
+function skipWhitespace(text, pos) {
+    while (pos < text.length) {
+        const c = text[pos];
+        if (c === "%") {
+            while (pos < text.length && text[pos] !== "\n" && text[pos] !== "\r") pos++;
+        } else if (" \t\r\n\f\0".includes(c)) {
+            pos++;
+        } else {
+            break;
+        }
+    }
+    return pos;
+}
+
+function parseValue(text, pos) {
+    pos = skipWhitespace(text, pos);
+    if (pos >= text.length) throw new Error("Unexpected end of data");
+
+    if (text.startsWith("<<", pos)) {
+        const dict = {};
+        pos += 2;
+        for (;;) {
+            pos = skipWhitespace(text, pos);
+            if (pos >= text.length) throw new Error("Unterminated dictionary");
+            if (text.startsWith(">>", pos)) return { value: dict, pos: pos + 2 };
+
+            const key = parseValue(text, pos);
+            const value = parseValue(text, key.pos);
+            dict[key.value] = value.value;
+            pos = value.pos;
+        }
+    }
+
+    const c = text[pos];
+
+    if (c === "[") {
+        const arr = [];
+        pos += 1;
+        for (;;) {
+            pos = skipWhitespace(text, pos);
+            if (pos >= text.length) throw new Error("Unterminated array");
+            if (text[pos] === "]") return { value: arr, pos: pos + 1 };
+
+            const item = parseValue(text, pos);
+            arr.push(item.value);
+            pos = item.pos;
+        }
+    }
+
+    if (c === "/") {
+        const name = /\/[^\s\/\[\]<>(){}%]*/y;
+        name.lastIndex = pos;
+        const m = name.exec(text);
+        return { value: m[0], pos: name.lastIndex };
+    }
+
+    if (c === "(") {
+        let depth = 0;
+        for (; pos < text.length; pos++) {
+            if (text[pos] === "\\") pos++;
+            else if (text[pos] === "(") depth++;
+            else if (text[pos] === ")" && --depth === 0) return { value: null, pos: pos + 1 };
+        }
+        throw new Error("Unterminated string");
+    }
+
+    if (c === "<") {
+        const end = text.indexOf(">", pos);
+        if (end === -1) throw new Error("Unterminated hex string");
+        return { value: null, pos: end + 1 };
+    }
+
+    // Indirect reference "n g R" before plain numbers
+    const ref = /(\d+)\s+(\d+)\s+R(?![A-Za-z])/y;
+    ref.lastIndex = pos;
+    const r = ref.exec(text);
+    if (r) {
+        return { value: { ref: parseInt(r[1], 10), gen: parseInt(r[2], 10) }, pos: ref.lastIndex };
+    }
+
+    const number = /[+-]?(\d+\.?\d*|\.\d+)/y;
+    number.lastIndex = pos;
+    const n = number.exec(text);
+    if (n) return { value: parseFloat(n[0]), pos: number.lastIndex };
+
+    const keyword = /[A-Za-z]+/y;
+    keyword.lastIndex = pos;
+    const k = keyword.exec(text);
+    if (k) {
+        const keywords = { true: true, false: false, null: null };
+        if (k[0] in keywords) return { value: keywords[k[0]], pos: keyword.lastIndex };
+    }
+
+    throw new Error("Unexpected token");
+}
+
+// --------------------------------------
+// BYTE HELPERS
+// --------------------------------------
+
+async function readBytes(file, start, end) {
+    const buffer = await file.slice(start, end).arrayBuffer();
+    return new Uint8Array(buffer);
+}
+
+// Latin-1: one char per byte, so string offsets equal byte offsets
+function bytesToString(bytes) {
+    let out = "";
+    for (let i = 0; i < bytes.length; i += 8192) {
+        out += String.fromCharCode.apply(null, bytes.subarray(i, i + 8192));
+    }
+    return out;
+}
+
+function mmFromPoints(valuePt) {
+    return valuePt * 0.352778; // 1 pt = 1/72 inch; 25.4 / 72 ≈ 0.352778
+}
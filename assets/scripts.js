@@ -9,7 +9,7 @@ const specCheckOverlay = document.getElementById("specCheckOverlay");
 
 // STATE
 let nextSectionId = 1;
-// Each entry: { id, rootEl, specSelect, dropArea, browseBtn, fileInput, uploadOverlay, uploadConfirm, resultHolder, files: [] }
+// Each entry: { id, rootEl, specSelect, pageModeSelect, dropArea, browseBtn, fileInput, uploadOverlay, uploadConfirm, resultHolder, files: [] }
 const sections = [];
 
 // Disable check button on load
@@ -30,6 +30,7 @@ function initSection(sectionEl) {
     sectionEl.dataset.sectionId = String(id);
 
     const specSelect    = sectionEl.querySelector(".spec-select");
+    const pageModeSelect = sectionEl.querySelector(".page-mode-select");
     const dropArea      = sectionEl.querySelector(".drop-area");
     const browseBtn     = sectionEl.querySelector(".browse-btn");
     const fileInput     = sectionEl.querySelector(".file-input");
@@ -51,16 +52,24 @@ function initSection(sectionEl) {
         id,
         rootEl: sectionEl,
         specSelect,
+        pageModeSelect,
         dropArea,
         browseBtn,
         fileInput,
         uploadOverlay,
         uploadConfirm,
         resultHolder,
-        files: []
+        files: [],
+        precheckRun: 0
     };
     sections.push(state);
 
+    // Re-run the pre-check when the size or page mode changes
+    specSelect.addEventListener("change", () => runChangedPrechecks(state));
+    if (pageModeSelect) {
+        pageModeSelect.addEventListener("change", () => runChangedPrechecks(state));
+    }
+
     // Browse click → open file picker
     browseBtn.addEventListener("click", () => fileInput.click());
 
@@ -108,9 +117,56 @@ function handleFilesSelected(section, files) {
         if (section.uploadConfirm) section.uploadConfirm.classList.remove("hidden");
     }, 800);
 
+    runPrechecks(section);
     enableCheckButton();
 }
 
+// Header-only pre-check (precheck.js): show failures straight away
+async function runPrechecks(section) {
+    // Stale state from before "Reset all"
+    if (!sections.includes(section)) return;
+
+    const run = ++section.precheckRun;
+    const specName = section.specSelect.value;
+    const pageMode = section.pageModeSelect ? section.pageModeSelect.value : "single";
+    const orderedCount = getOrderedSpecs().length;
+
+    const failures = [];
+    if (specName) {
+        for (const file of section.files) {
+            const pre = await precheckFile(file, specName, pageMode, orderedCount);
+            // A newer run (new files / size change) or a reset has taken over
+            if (run !== section.precheckRun || !sections.includes(section)) return;
+            if (pre) failures.push({ fileName: file.name, spec: specName, ...pre });
+        }
+    }
+
+    if (!section.resultHolder) return;
+    section.resultHolder.innerHTML = "";
+    failures.forEach((result) => {
+        section.resultHolder.appendChild(buildResultBox(result));
+    });
+}
+
+// The changed section, plus any "order" sections (they count sizes across
+// all sections). Other sections keep their results from Check Specs.
+function runChangedPrechecks(changed) {
+    runPrechecks(changed);
+    sections
+        .filter((s) => s !== changed && s.files && s.files.length > 0)
+        .filter((s) => s.pageModeSelect && s.pageModeSelect.value === "order")
+        .forEach((s) => runPrechecks(s));
+}
+
+// Static sizes selected across all sections, top to bottom ("order" page mode).
+// Digital sizes belong to JPG sections, not pages of a PDF.
+function getOrderedSpecs() {
+    return sections
+        .map((s) => s.specSelect.value)
+        .filter((v) => v)
+        .filter((v) => !SPEC_DATA || !SPEC_DATA[v] || SPEC_DATA[v].format === "static");
+}
+
 function enableCheckButton() {
     checkBtn.classList.remove("disabled");
     checkBtn.disabled = false;
@@ -139,6 +195,8 @@ checkBtn.addEventListener("click", async () => {
         }
     }
 
+    const orderedSpecs = getOrderedSpecs();
+
     // Map: sectionId → [results]
     const sectionResults = new Map();
 
@@ -149,12 +207,32 @@ checkBtn.addEventListener("click", async () => {
     try {
         for (const s of activeSections) {
             const specName = s.specSelect.value;
+            const pageMode = s.pageModeSelect ? s.pageModeSelect.value : "single";
 
             for (const file of s.files) {
+                if (!sectionResults.has(s.id)) {
+                    sectionResults.set(s.id, []);
+                }
+
+                // Only upload files that pass the in-browser pre-check
+                const pre = await precheckFile(file, specName, pageMode, orderedSpecs.length);
+                if (pre) {
+                    sectionResults.get(s.id).push({ fileName: file.name, spec: specName, ...pre });
+                    continue;
+                }
+
                 const formData = new FormData();
                 formData.append("file", file);
                 formData.append("spec_option", specName);
 
+                // Multi-page mode only applies to PDFs
+                if (file.name.toLowerCase().endsWith(".pdf") && pageMode !== "single") {
+                    formData.append("page_mode", pageMode);
+                    if (pageMode === "order") {
+                        orderedSpecs.forEach((v) => formData.append("page_specs", v));
+                    }
+                }
+
                 try {
                     const response = await fetch("/check", {
                         method: "POST",
@@ -171,14 +249,8 @@ checkBtn.addEventListener("click", async () => {
                         issues: data.issues || [],
                     };
 
-                    if (!sectionResults.has(s.id)) {
-                        sectionResults.set(s.id, []);
-                    }
                     sectionResults.get(s.id).push(resultObj);
                 } catch (err) {
-                    if (!sectionResults.has(s.id)) {
-                        sectionResults.set(s.id, []);
-                    }
                     sectionResults.get(s.id).push({
                         fileName: file.name,
                         spec: specName,
@@ -216,40 +288,44 @@ function renderSectionResults(sectionResults) {
         const holder = section.resultHolder;
 
         results.forEach((result) => {
-            const box = document.createElement("div");
-            box.className = "result-box";
-
-            if (result.status === "pass") {
-                box.innerHTML = `
-                    <div class="result-pass">
-                        <strong>✔ ${result.fileName} — Pass</strong>
-                        <div class="result-message">${result.message}</div>
-                    </div>
-                `;
-            } else if (result.status === "fail") {
-                const issues = (result.issues || [])
-                    .map((i) => `<li>${i}</li>`)
-                    .join("");
-
-                box.innerHTML = `
-                    <div class="result-fail">
-                        <strong>✖ ${result.fileName} — Fail</strong>
-                        <ul>${issues}</ul>
-                    </div>
-                `;
-            } else {
-                box.innerHTML = `
-                    <div class="result-error">
-                        ⚠ ${result.fileName} — ${result.message}
-                    </div>
-                `;
-            }
-
-            holder.appendChild(box);
+            holder.appendChild(buildResultBox(result));
         });
     }
 }
 
+function buildResultBox(result) {
+    const box = document.createElement("div");
+    box.className = "result-box";
+
+    if (result.status === "pass") {
+        box.innerHTML = `
+            <div class="result-pass">
+                <strong>✔ ${result.fileName} — Pass</strong>
+                <div class="result-message">${result.message}</div>
+            </div>
+        `;
+    } else if (result.status === "fail") {
+        const issues = (result.issues || [])
+            .map((i) => `<li>${i}</li>`)
+            .join("");
+
+        box.innerHTML = `
+            <div class="result-fail">
+                <strong>✖ ${result.fileName} — Fail</strong>
+                <ul>${issues}</ul>
+            </div>
+        `;
+    } else {
+        box.innerHTML = `
+            <div class="result-error">
+                ⚠ ${result.fileName} — ${result.message}
+            </div>
+        `;
+    }
+
+    return box;
+}
+
 // --------------------------------------
 // ADD ANOTHER SIZE
 // --------------------------------------
@@ -265,6 +341,9 @@ addSizeBtn.addEventListener("click", () => {
     const specSelect = clone.querySelector(".spec-select");
     if (specSelect) specSelect.value = "";
 
+    const pageModeSelect = clone.querySelector(".page-mode-select");
+    if (pageModeSelect) pageModeSelect.value = "single";
+
     const fileInput = clone.querySelector(".file-input");
     if (fileInput) fileInput.value = "";
 
@@ -302,6 +381,7 @@ resetAllBtn.addEventListener("click", () => {
     const first = sectionsContainer.querySelector(".spec-section");
     if (first) {
         const specSelect = first.querySelector(".spec-select");
+        const pageModeSelect = first.querySelector(".page-mode-select");
         const fileInput = first.querySelector(".file-input");
         const uploadConfirm = first.querySelector(".upload-confirm");
         const uploadOverlay = first.querySelector(".upload-overlay");
@@ -309,6 +389,7 @@ resetAllBtn.addEventListener("click", () => {
         const resultHolder = first.querySelector(".section-results");
 
         if (specSelect) specSelect.value = "";
+        if (pageModeSelect) pageModeSelect.value = "single";
         if (fileInput) fileInput.value = "";
         if (uploadConfirm) uploadConfirm.classList.add("hidden");
         if (uploadOverlay) uploadOverlay.classList.add("hidden");
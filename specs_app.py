@@ -4,6 +4,7 @@ from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
+from typing import List
 from specs_utils import run_checks
 from specs_data import SPECS
 
@@ -52,6 +53,13 @@ async def home():
                         {options_html}
                     </select>
 
+                    <select class="dropdown page-mode-select">
+                        <option value="single" selected>Single-page PDF</option>
+                        <option value="label">Multi-page PDF: match pages by label</option>
+                        <option value="order">Multi-page PDF: one page per selected size, top to bottom</option>
+                        <option value="auto">Multi-page PDF: auto-detect size per page</option>
+                    </select>
+
                     <div class="drop-area">
                         <p>Drag & drop artwork here!</p>
                         <button class="gawk-button browse-btn">Browse Files</button>
@@ -104,6 +112,7 @@ async def home():
             Reset all
         </button>
 
+        <script src="/assets/precheck.js"></script>
         <script src="/assets/scripts.js"></script>
 
     </body>
@@ -111,12 +120,22 @@ async def home():
     """
 
 
+@app.get("/specs")
+async def specs_json():
+    """
+    JSON export of SPECS for the in-browser pre-check
+    """
+    return SPECS
+
+
 @app.post("/check")
 async def check_specs(
     spec_option: str = Form(...),
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    page_mode: str = Form("single"),
+    page_specs: List[str] = Form([]),
 ):
-    result = await run_checks(file, spec_option)
+    result = await run_checks(file, spec_option, page_mode, page_specs)
     return result
 
 
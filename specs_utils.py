@@ -1,22 +1,50 @@
 # specs_utils.py
 
 from specs_data import SPECS
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from PIL import Image
 from pypdf import PdfReader
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
 import io
 import math
+import multiprocessing
+import os
+import struct
+import weakref
+
+# Multi-page PDF mode: how pages are mapped to specs
+PAGE_MODES = ("single", "label", "order", "auto")
+
+# Process pool for multi-page PDFs: at most this many workers,
+# and only once there are enough pages to outweigh spawning them
+PDF_PAGE_WORKERS = min(4, os.cpu_count() or 1)
+PDF_PAGES_PER_WORKER = 25
+
+# Parsed image stream headers: {reader: {(idnum, generation): header}}
+_IMAGE_HEADER_CACHE = weakref.WeakKeyDictionary()
 
 # ============================================================
 # MAIN ENTRY POINT
 # ============================================================
 
-async def run_checks(file, spec_option) -> Dict[str, Any]:
+async def run_checks(
+    file,
+    spec_option,
+    page_mode: str = "single",
+    page_specs: Optional[List[str]] = None,
+) -> Dict[str, Any]:
     """
     Receives the file + dropdown selection and routes to the correct checker.
     Enforces:
     - Digital specs -> JPG only
     - Static specs  -> PDF only
+
+    page_mode (PDF only):
+    - "single" -> one-page PDF checked against the selected spec
+    - "label"  -> each page matched to a spec by its page label
+    - "order"  -> page N checked against page_specs[N]
+    - "auto"   -> each page matched to a spec by its detected size
     """
 
     specs = SPECS.get(spec_option)
@@ -65,7 +93,16 @@ async def run_checks(file, spec_option) -> Dict[str, Any]:
                 ],
             }
 
-        return check_pdf(file_bytes, specs)
+        if page_mode == "single":
+            return check_pdf(file_bytes, specs)
+
+        if page_mode not in PAGE_MODES:
+            return {"status": "error", "message": "Unknown page mode selected."}
+
+        # Long multi-page checks run off the event loop
+        return await asyncio.to_thread(
+            check_pdf_multipage, file_bytes, spec_option, page_mode, page_specs
+        )
 
     # --------------- ANYTHING ELSE -----------------------
     return {
@@ -199,6 +236,30 @@ def check_pdf(file_bytes: bytes, specs: Dict[str, Any]) -> Dict[str, Any]:
             "Multi-page PDF detected. Please re-upload as single-page PDF."
         )
 
+    issues.extend(check_pdf_page(page, specs))
+
+    # ---------- Final result ----------
+    if issues:
+        return {
+            "status": "fail",
+            "message": "❌ Artwork DOES NOT meet specifications.",
+            "issues": issues,
+        }
+
+    return {
+        "status": "pass",
+        "message": "✅ Artwork meets specifications. Ready to send to print.",
+    }
+
+
+def check_pdf_page(page, specs: Dict[str, Any]) -> List[str]:
+    """
+    Runs the size, box, colour and DPI checks for a single PDF page.
+    Returns the list of issues (empty if the page passes).
+    """
+
+    issues = []
+
     # ---------- Page size (mm) ----------
     expected_w_mm = specs["width_mm"]
     expected_h_mm = specs["height_mm"]
@@ -263,6 +324,14 @@ def check_pdf(file_bytes: bytes, specs: Dict[str, Any]) -> Dict[str, Any]:
             "Please convert to CMYK and re-upload."
         )
 
+    # ---------- Embedded image streams vs their dictionaries ----------
+    if image_streams_mismatch(page):
+        issues.append(
+            "Embedded image data does not match its PDF settings "
+            "(size, bit depth or colour channels). "
+            "Please re-export the PDF and re-upload."
+        )
+
     # ---------- Approx DPI check for raster images ----------
     min_dpi = estimate_min_image_dpi(page, page_w_mm, page_h_mm)
     expected_dpi = specs["dpi"]
@@ -274,20 +343,239 @@ def check_pdf(file_bytes: bytes, specs: Dict[str, Any]) -> Dict[str, Any]:
             f"Static print requires {expected_dpi}dpi. Please adjust and re-upload."
         )
 
-    # ---------- Final result ----------
+    return issues
+
+
+# ============================================================
+# MULTI-PAGE PDF CHECKER
+# ============================================================
+
+def check_pdf_multipage(
+    file_bytes: bytes,
+    spec_option: str,
+    page_mode: str,
+    page_specs: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Validates a multi-page PDF where each page is its own board.
+
+    Pages are mapped to specs by label, order or detected size
+    (see run_checks) and run the same checks as check_pdf.
+    Label / auto pages that match no board are checked against the
+    selected spec.
+
+    Larger PDFs are split into contiguous page batches across a process
+    pool (pypdf is pure Python, so threads wouldn't run in parallel).
+    Each worker opens one lazy PdfReader and only resolves its own pages.
+    """
+
+    try:
+        reader = PdfReader(io.BytesIO(file_bytes))
+        num_pages = len(reader.pages)
+        labels = reader.page_labels
+    except Exception:
+        return {
+            "status": "fail",
+            "message": "❌ Artwork DOES NOT meet specifications.",
+            "issues": [
+                "Unable to read PDF file. Please re-upload a clean, print-ready PDF file."
+            ],
+        }
+
+    if num_pages == 0:
+        return {
+            "status": "fail",
+            "message": "❌ Artwork DOES NOT meet specifications.",
+            "issues": ["PDF has no pages. Please re-upload a print-ready PDF file."],
+        }
+
+    if page_mode == "order":
+        page_specs = page_specs or []
+        if len(page_specs) != num_pages:
+            return {
+                "status": "fail",
+                "message": "❌ Artwork DOES NOT meet specifications.",
+                "issues": [
+                    f"PDF has {num_pages} page(s) but {len(page_specs)} size(s) "
+                    "were selected. Please select one size per page and re-upload."
+                ],
+            }
+
+    labels = [
+        labels[i] if i < len(labels) else str(i + 1) for i in range(num_pages)
+    ]
+
+    workers = min(PDF_PAGE_WORKERS, num_pages // PDF_PAGES_PER_WORKER)
+
+    if workers <= 1:
+        pages = [
+            check_pdf_mapped_page(
+                reader.pages[index], index, labels[index],
+                spec_option, page_mode, page_specs,
+            )
+            for index in range(num_pages)
+        ]
+    else:
+        # Workers open their own readers; drop ours before they start
+        del reader
+        size = math.ceil(num_pages / workers)
+        batches = [
+            list(range(start, min(start + size, num_pages)))
+            for start in range(0, num_pages, size)
+        ]
+
+        # spawn: this runs in a worker thread, where forking isn't safe
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    check_pdf_page_batch, file_bytes, batch,
+                    [labels[i] for i in batch], spec_option, page_mode, page_specs,
+                )
+                for batch in batches
+            ]
+            pages = [page for future in futures for page in future.result()]
+
+    # Flattened issues keep the response readable by the single-page front-end
+    issues = []
+    for p in pages:
+        name = f"Page {p['page']}"
+        if p["label"] != str(p["page"]):
+            name += f" ({p['label']})"
+        issues.extend(f"{name}: {issue}" for issue in p["issues"])
+
     if issues:
         return {
             "status": "fail",
             "message": "❌ Artwork DOES NOT meet specifications.",
             "issues": issues,
+            "pages": pages,
         }
 
     return {
         "status": "pass",
         "message": "✅ Artwork meets specifications. Ready to send to print.",
+        "pages": pages,
     }
 
 
+def check_pdf_page_batch(
+    file_bytes: bytes,
+    indices: List[int],
+    labels: List[str],
+    spec_option: str,
+    page_mode: str,
+    page_specs: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Worker entry point: opens the PDF once and checks the given pages.
+    """
+    reader = PdfReader(io.BytesIO(file_bytes))
+    return [
+        check_pdf_mapped_page(
+            reader.pages[index], index, label, spec_option, page_mode, page_specs
+        )
+        for index, label in zip(indices, labels)
+    ]
+
+
+def check_pdf_mapped_page(
+    page,
+    index: int,
+    label: str,
+    spec_option: str,
+    page_mode: str,
+    page_specs: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Maps one page to a spec (label, order or auto) and checks it.
+    Returns the per-page result used in check_pdf_multipage's "pages".
+    """
+    if page_mode == "order":
+        spec_name = page_specs[index]
+        page_spec = SPECS.get(spec_name)
+        if page_spec is None or page_spec.get("format") != "static":
+            return {
+                "page": index + 1,
+                "label": label,
+                "spec": spec_name,
+                "status": "fail",
+                "issues": [
+                    f"Selected size {spec_name} is not a static print size. "
+                    "Please select a static board size for this page."
+                ],
+            }
+        unmatched = False
+    else:
+        if page_mode == "label":
+            spec_name = match_spec_by_label(label)
+        else:
+            spec_name = match_spec_by_size(get_pdf_page_size_mm(page))
+
+        page_spec = SPECS.get(spec_name) if spec_name else None
+        unmatched = page_spec is None
+        if unmatched:
+            spec_name, page_spec = spec_option, SPECS[spec_option]
+
+    try:
+        page_issues = check_pdf_page(page, page_spec)
+    except Exception:
+        page_issues = [
+            "Unable to read this page. Please re-upload a clean, print-ready PDF file."
+        ]
+
+    # Only explain the fallback when it matters. In auto mode an unmatched
+    # page always fails on size, and that message already shows the spec size.
+    if unmatched and page_issues and page_mode == "label":
+        page_issues.insert(
+            0,
+            f"Page label not recognised as a board size. Checked against {spec_option}.",
+        )
+
+    return {
+        "page": index + 1,
+        "label": label,
+        "spec": spec_name,
+        "status": "fail" if page_issues else "pass",
+        "issues": page_issues,
+    }
+
+
+def match_spec_by_label(label: str) -> Optional[str]:
+    """
+    Matches a PDF page label to a static spec key.
+    Accepts the full key, the board name ("Supersite") or the size ("12.66m x 3.35m").
+    """
+    wanted = label.strip().lower()
+    if not wanted:
+        return None
+
+    for key, spec in SPECS.items():
+        if spec.get("format") != "static":
+            continue
+        name = key.split(" (")[0]
+        if wanted in (key.lower(), name.lower(), spec["size"].lower()):
+            return key
+
+    return None
+
+
+def match_spec_by_size(size_mm: Dict[str, float], tol: float = 0.5) -> Optional[str]:
+    """Finds the static spec whose width_mm / height_mm match the page size."""
+    for key, spec in SPECS.items():
+        if spec.get("format") != "static":
+            continue
+        if (
+            abs(size_mm["width_mm"] - spec["width_mm"]) <= tol
+            and abs(size_mm["height_mm"] - spec["height_mm"]) <= tol
+        ):
+            return key
+
+    return None
+
+
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
@@ -340,6 +628,14 @@ def page_has_rgb(page) -> bool:
     if "DeviceRGB" in res_str or "CalRGB" in res_str:
         return True
 
+    # The dictionary can claim CMYK while the JPEG / JPX data inside is RGB
+    for xobj_ref, xobj in iter_page_images(page):
+        header = inspect_image_stream(xobj_ref, xobj)
+        if not header or image_colour_components(xobj, header) != 3:
+            continue
+        if colour_space_family(get_resolved(xobj, "/ColorSpace")) != "/Lab":
+            return True
+
     return False
 
 
@@ -351,30 +647,20 @@ def estimate_min_image_dpi(page, page_w_mm: float, page_h_mm: float) -> Optional
     - If images are found, returns the minimum of width/height DPI estimates.
     """
 
-    resources = page.get("/Resources")
-    if not resources:
-        return None
-
-    xobjects = resources.get("/XObject")
-    if not xobjects:
-        return None
-
     page_w_in = page_w_mm / 25.4
     page_h_in = page_h_mm / 25.4
 
     dpis = []
 
-    for xobj_ref in xobjects.values():
-        try:
-            xobj = xobj_ref.get_object()
-        except Exception:
-            continue
-
-        if xobj.get("/Subtype") != "/Image":
-            continue
-
-        width_px = xobj.get("/Width")
-        height_px = xobj.get("/Height")
+    for xobj_ref, xobj in iter_page_images(page):
+        # Prefer the real pixel size from the stream header when we have it
+        header = inspect_image_stream(xobj_ref, xobj)
+        if header:
+            width_px = header["width"]
+            height_px = header["height"]
+        else:
+            width_px = get_resolved(xobj, "/Width")
+            height_px = get_resolved(xobj, "/Height")
 
         if not width_px or not height_px:
             continue
@@ -392,3 +678,262 @@ def estimate_min_image_dpi(page, page_w_mm: float, page_h_mm: float) -> Optional
         return None
 
     return min(dpis)
+
+
+# ============================================================
+# EMBEDDED IMAGE STREAM HEADERS
+# ============================================================
+
+def get_resolved(obj, key: str):
+    """dict.get for PDF dictionaries, following indirect references."""
+    value = obj.get(key)
+    if value is None:
+        return None
+    return value.get_object()
+
+
+def iter_page_images(page):
+    """Yields (reference, object) for each image XObject on the page."""
+    resources = page.get("/Resources")
+    if not resources:
+        return
+
+    xobjects = resources.get("/XObject")
+    if not xobjects:
+        return
+
+    for xobj_ref in xobjects.values():
+        try:
+            xobj = xobj_ref.get_object()
+        except Exception:
+            continue
+
+        if get_resolved(xobj, "/Subtype") == "/Image":
+            yield xobj_ref, xobj
+
+
+def inspect_image_stream(xobj_ref, xobj) -> Optional[Dict[str, Any]]:
+    """
+    Reads the real width / height / components / bits of a JPEG or JPEG 2000
+    image stream from its header bytes, without decoding any pixel data.
+
+    Returns None for other filters (or chained filters) and unreadable headers.
+    Results are cached per PDF object, so shared images are only parsed once.
+    """
+    cache = None
+    key = None
+    reader = getattr(xobj_ref, "pdf", None)
+    if reader is not None and hasattr(xobj_ref, "idnum"):
+        cache = _IMAGE_HEADER_CACHE.setdefault(reader, {})
+        key = (xobj_ref.idnum, xobj_ref.generation)
+        if key in cache:
+            return cache[key]
+
+    header = None
+    filters = get_resolved(xobj, "/Filter")
+    if isinstance(filters, list):
+        filters = filters[0] if len(filters) == 1 else None
+
+    try:
+        # DCT / JPX "decoding" in pypdf passes the raw bytes straight through
+        if filters == "/DCTDecode":
+            header = read_jpeg_header(xobj.get_data())
+        elif filters == "/JPXDecode":
+            header = read_jpx_header(xobj.get_data())
+    except Exception:
+        header = None
+
+    if header:
+        header["filter"] = filters
+
+    if cache is not None:
+        cache[key] = header
+
+    return header
+
+
+def read_jpeg_header(data: bytes) -> Optional[Dict[str, Any]]:
+    """Walks JPEG markers up to the first SOF segment."""
+    if data[:2] != b"\xff\xd8":
+        return None
+
+    pos = 2
+
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+
+        marker = data[pos + 1]
+        # Fill bytes / standalone markers carry no length
+        if marker == 0xFF:
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            pos += 2
+            continue
+
+        (length,) = struct.unpack(">H", data[pos + 2:pos + 4])
+        segment = data[pos + 4:pos + 2 + length]
+
+        # SOF0–SOF15, excluding DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            if len(segment) < 6:
+                return None
+            bits, height, width, components = struct.unpack(">BHHB", segment[:6])
+            return {
+                "width": width,
+                "height": height,
+                "components": components,
+                "bits": bits,
+            }
+
+        # Start of scan: no SOF found before the pixel data
+        if marker == 0xDA:
+            return None
+
+        pos += 2 + length
+
+    return None
+
+
+def read_jpx_header(data: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Reads a JPEG 2000 header: the ihdr box of a JP2 file,
+    or the SIZ marker of a bare codestream.
+    """
+    # Bare codestream: SOC (FF4F) then SIZ (FF51)
+    if data[:4] == b"\xff\x4f\xff\x51":
+        if len(data) < 43:
+            return None
+        xsiz, ysiz, xosiz, yosiz = struct.unpack(">IIII", data[8:24])
+        (components,) = struct.unpack(">H", data[40:42])
+        return {
+            "width": xsiz - xosiz,
+            "height": ysiz - yosiz,
+            "components": components,
+            "bits": (data[42] & 0x7F) + 1,
+        }
+
+    # JP2 boxes: walk top level until jp2h, then find ihdr inside it
+    pos = 0
+    end = len(data)
+    while pos + 8 <= end:
+        box_len, box_type = struct.unpack(">I4s", data[pos:pos + 8])
+        header_len = 8
+        if box_len == 1:
+            if pos + 16 > end:
+                return None
+            (box_len,) = struct.unpack(">Q", data[pos + 8:pos + 16])
+            header_len = 16
+        elif box_len == 0:
+            box_len = end - pos
+
+        if box_len < header_len:
+            return None
+
+        if box_type == b"jp2h":
+            # Superbox: descend into its children
+            end = pos + box_len
+            pos += header_len
+            continue
+
+        if box_type == b"ihdr":
+            body = data[pos + header_len:pos + header_len + 11]
+            if len(body) < 11:
+                return None
+            height, width, components, bpc = struct.unpack(">IIHB", body)
+            return {
+                "width": width,
+                "height": height,
+                "components": components,
+                # 255 = bit depth varies per component
+                "bits": (bpc & 0x7F) + 1 if bpc != 255 else None,
+            }
+
+        # Pixel data reached without a header
+        if box_type == b"jp2c":
+            return None
+
+        pos += box_len
+
+    return None
+
+
+def colour_space_family(colour_space) -> Optional[str]:
+    """Returns the colour space family name, e.g. /DeviceCMYK or /ICCBased."""
+    if colour_space is None:
+        return None
+    try:
+        colour_space = colour_space.get_object()
+    except AttributeError:
+        pass
+    if isinstance(colour_space, list):
+        return str(colour_space[0]) if colour_space else None
+    return str(colour_space)
+
+
+def colour_space_components(colour_space) -> Optional[int]:
+    """Number of colour components a PDF colour space declares, if known."""
+    family = colour_space_family(colour_space)
+    counts = {
+        "/DeviceGray": 1, "/CalGray": 1, "/G": 1,
+        "/DeviceRGB": 3, "/CalRGB": 3, "/Lab": 3, "/RGB": 3,
+        "/DeviceCMYK": 4, "/CMYK": 4,
+        "/Indexed": 1, "/I": 1, "/Separation": 1,
+    }
+    if family in counts:
+        return counts[family]
+
+    try:
+        colour_space = colour_space.get_object()
+        if family == "/ICCBased":
+            return int(colour_space[1].get_object()["/N"])
+        if family == "/DeviceN":
+            return len(colour_space[1])
+    except Exception:
+        return None
+
+    return None
+
+
+def image_streams_mismatch(page) -> bool:
+    """
+    True if any JPEG / JPEG 2000 image's header disagrees with its
+    dictionary on width, height, bit depth or component count.
+
+    3-component data inside a non-RGB colour space is left to page_has_rgb.
+    """
+    for xobj_ref, xobj in iter_page_images(page):
+        header = inspect_image_stream(xobj_ref, xobj)
+        if not header:
+            continue
+
+        if (
+            get_resolved(xobj, "/Width") != header["width"]
+            or get_resolved(xobj, "/Height") != header["height"]
+        ):
+            return True
+
+        # JPX bit depth comes from the codestream; /BitsPerComponent is ignored
+        declared_bits = get_resolved(xobj, "/BitsPerComponent")
+        if header["filter"] == "/DCTDecode" and declared_bits is not None:
+            if declared_bits != header["bits"]:
+                return True
+
+        declared = colour_space_components(get_resolved(xobj, "/ColorSpace"))
+        real = image_colour_components(xobj, header)
+        if declared is None or real == 3:
+            continue
+
+        if declared != real:
+            return True
+
+    return False
+
+
+def image_colour_components(xobj, header: Dict[str, Any]) -> int:
+    """Colour channels in the stream, not counting a JPX soft mask channel."""
+    components = header["components"]
+    if header["filter"] == "/JPXDecode" and get_resolved(xobj, "/SMaskInData"):
+        components -= 1
+    return components